@@ -0,0 +1,82 @@
+# Load test for the database connection pool under eventlet. Many greenlets check out a
+# connection, run a query and hold it for a simulated network round trip; each pool
+# configuration reports throughput, checkout waits (from server.PoolStats) and timeouts.
+# Uses a throwaway SQLite file unless --url points at a real server (e.g. local MySQL).
+#
+#   python benchmarks/db_pool.py --greenlets 200 --latency-ms 5
+#   python benchmarks/db_pool.py --url mysql+pymysql://root:pw@localhost:3306/chat_db --json results.json
+import eventlet
+eventlet.monkey_patch()
+
+import argparse, os, sys, tempfile, json
+from time import perf_counter
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='chat-bench-'), 'bench.db')
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{DB_PATH}')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import server
+
+CONFIGS = [  # (name, pool_size, max_overflow, pre_ping)
+    ('default-like 5+10', 5, 10, False),
+    ('small 5+0', 5, 0, True),
+    ('tuned 10+20', 10, 20, True),
+    ('tuned 10+20 no pre-ping', 10, 20, False),
+    ('large 40+20', 40, 20, True),
+]
+
+def worker(engine, requests, latency):
+    timeouts = 0
+    for _ in range(requests):
+        try:
+            with engine.connect() as conn:
+                conn.execute(text('SELECT 1')).scalar()
+                eventlet.sleep(latency)  # Round trip to a remote database
+        except PoolTimeoutError:
+            timeouts += 1
+    return timeouts
+
+def run(url, name, pool_size, max_overflow, pre_ping, args):
+    engine = create_engine(url, poolclass=server.InstrumentedQueuePool, pool_size=pool_size,
+                           max_overflow=max_overflow, pool_timeout=args.timeout, pool_pre_ping=pre_ping)
+    server.db_pool_stats.reset()
+    pool = eventlet.GreenPool(args.greenlets)
+    started = perf_counter()
+    threads = [pool.spawn(worker, engine, args.requests, args.latency_ms / 1000) for _ in range(args.greenlets)]
+    timeouts = sum(thread.wait() for thread in threads)
+    elapsed = perf_counter() - started
+    stats = server.db_pool_stats.stats(engine.pool)
+    engine.dispose()
+    return {
+        'config': name,
+        'queries_per_s': round((args.greenlets * args.requests - timeouts) / elapsed, 1),
+        'wait_avg_ms': stats['wait_avg_ms'],
+        'wait_max_ms': stats['wait_max_ms'],
+        'timeouts': stats['timeouts'],
+        'wait_histogram': stats['wait_histogram'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default=os.environ['DATABASE_URL'], help='database to test against')
+    parser.add_argument('--greenlets', type=int, default=200, help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=20, help='queries per client')
+    parser.add_argument('--latency-ms', type=float, default=5, help='simulated round trip per query')
+    parser.add_argument('--timeout', type=float, default=5, help='pool checkout timeout in seconds')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    results = [run(args.url, *config, args) for config in CONFIGS]
+
+    print(f"{'config':<26} {'queries/s':>10} {'avg wait ms':>12} {'max wait ms':>12} {'timeouts':>9}")
+    for result in results:
+        print(f"{result['config']:<26} {result['queries_per_s']:>10} {result['wait_avg_ms']:>12} "
+              f"{result['wait_max_ms']:>12} {result['timeouts']:>9}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# Measures /download throughput over a real socket: full transfers, random Range requests
+# (video seeking) and ETag revalidations. server.py runs in a background thread against a
+# throwaway SQLite database and blob folder.
+#
+#   python benchmarks/download_throughput.py --size-mb 64 --json results.json
+import argparse, os, sys, tempfile, threading, random, json, hashlib, http.client, logging
+from time import perf_counter
+
+WORK_DIR = tempfile.mkdtemp(prefix='chat-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.chdir(WORK_DIR)  # uploads/ is created relative to the working directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+from werkzeug.serving import make_server
+import server
+from server import app, db, User
+
+PASSWORD = 'Bench!Passw0rd'
+
+def start_server():
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # No per-request access log
+    httpd = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd.server_port
+
+def login(port):
+    with app.app_context():
+        db.create_all()
+        password_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+        db.session.add(User(username='bench', email='bench@bench.local', password_hash=password_hash))
+        db.session.commit()
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('POST', '/login', json.dumps({'email': 'bench', 'password': PASSWORD}),
+                 {'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    response.read()
+    return response.getheader('Set-Cookie').split(';', 1)[0]
+
+def create_blob(size):
+    # Write the blob straight into the store, as a completed upload would
+    data = os.urandom(1024 * 1024)
+    digest = hashlib.sha256()
+    path = os.path.join(WORK_DIR, 'blob.tmp')
+    with open(path, 'wb') as f:
+        for _ in range(size // len(data)):
+            f.write(data)
+            digest.update(data)
+    sha256 = digest.hexdigest()
+    os.makedirs(os.path.dirname(server.blob_path(sha256)), exist_ok=True)
+    os.replace(path, server.blob_path(sha256))
+    return sha256
+
+def timed_get(conn, url, headers):
+    started = perf_counter()
+    conn.request('GET', url, headers=headers)
+    response = conn.getresponse()
+    body_size = 0
+    while True:
+        block = response.read(1024 * 1024)
+        if not block:
+            break
+        body_size += len(block)
+    return response.status, body_size, perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=64, help='size of the test file')
+    parser.add_argument('--full', type=int, default=5, help='full downloads to time')
+    parser.add_argument('--ranges', type=int, default=200, help='random 1MB Range requests to time')
+    parser.add_argument('--revalidations', type=int, default=500, help='If-None-Match requests to time')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    port = start_server()
+    cookie = login(port)
+    size = args.size_mb * 1024 * 1024
+    sha256 = create_blob(size)
+    url = f'/download/{sha256}/bench.mp4'
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    headers = {'Cookie': cookie}
+
+    full = [timed_get(conn, url, headers) for _ in range(args.full)]
+    assert all(status == 200 and length == size for status, length, _ in full)
+
+    ranges = []
+    for _ in range(args.ranges):
+        start = random.randrange(0, size - 1024 * 1024)
+        ranges.append(timed_get(conn, url, dict(headers, Range=f'bytes={start}-{start + 1024 * 1024 - 1}')))
+    assert all(status == 206 for status, _, _ in ranges)
+
+    etag = f'"{sha256}"'
+    revalidations = [timed_get(conn, url, dict(headers, **{'If-None-Match': etag})) for _ in range(args.revalidations)]
+    assert all(status == 304 for status, _, _ in revalidations)
+
+    full_seconds = sum(seconds for _, _, seconds in full)
+    results = {
+        'file_mb': args.size_mb,
+        'full_mb_per_s': round(args.size_mb * args.full / full_seconds, 1),
+        'range_requests_per_s': round(args.ranges / sum(seconds for _, _, seconds in ranges), 1),  # 1MB each
+        'revalidations_per_s': round(args.revalidations / sum(seconds for _, _, seconds in revalidations), 1),
+    }
+
+    for name, value in results.items():
+        print(f"{name:<22} {value}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
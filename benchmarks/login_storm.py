@@ -0,0 +1,131 @@
+# Measures how much a burst of logins delays chat messages.
+# It runs server.py in-process against a throwaway SQLite database, sends a chat message every
+# few milliseconds from one socket and fires N concurrent logins in the middle of the run.
+# Each mode (bcrypt inline on the hub vs. offloaded to the thread pool) is reported separately,
+# together with the database pool checkout waits; logins must not hold a pooled connection while
+# bcrypt runs, so the offloaded mode fails if the longest wait exceeds --max-pool-wait-ms.
+#
+#   python benchmarks/login_storm.py --logins 50 --rounds 12
+import eventlet
+eventlet.monkey_patch()
+
+import argparse, os, sys, tempfile, statistics, json
+from time import perf_counter
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix='chat-bench-'), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+import server
+from server import app, db, socketio, User
+
+PASSWORD = 'Bench!Passw0rd'
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def setup_users(count, rounds):
+    password_hash = bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+    with app.app_context():
+        db.drop_all()
+        server.apply_migrations()  # Also seeds the default room the pinger posts to
+        db.session.add(User(username='pinger', email='pinger@bench.local', password_hash=password_hash))
+        for i in range(count):
+            db.session.add(User(username=f'bench{i}', email=f'bench{i}@bench.local', password_hash=password_hash))
+        db.session.commit()
+
+def login(username):
+    client = app.test_client()
+    response = client.post('/login', json={'email': username, 'password': PASSWORD})
+    assert response.status_code == 200, response.get_json()
+    return client
+
+def run_mode(offload, logins, interval, duration):
+    app.config['BCRYPT_OFFLOAD'] = offload
+    http = login('pinger')
+    sock = socketio.test_client(app, flask_test_client=http, auth={'username': 'pinger'})
+    sock.emit('request_username', {'custom': 'pinger'})
+    server.db_pool_stats.reset()
+
+    lags, storm = [], []
+    start = perf_counter()
+
+    def fire_logins():
+        eventlet.sleep(duration / 4)
+        storm.append(perf_counter())
+        pool = eventlet.GreenPool(logins)
+        for i in range(logins):
+            pool.spawn(login, f'bench{i}')
+        pool.waitall()
+        storm.append(perf_counter())
+
+    storm_thread = eventlet.spawn(fire_logins)
+    tick = 0
+    while perf_counter() - start < duration:
+        # Latency is how late the message handler finishes compared to an idle hub
+        due = perf_counter() + interval
+        eventlet.sleep(interval)
+        sock.emit('message', {'message': f'ping {tick}'})
+        sock.get_received()
+        done = perf_counter()
+        lags.append(((done - due) * 1000, done))
+        tick += 1
+    storm_thread.wait()
+    sock.disconnect()
+    with app.app_context():
+        pool_stats = server.db_pool_stats.stats(db.engine.pool)
+
+    during = [lag for lag, at in lags if storm[0] <= at <= storm[1]] or [0.0]
+    quiet = [lag for lag, at in lags if not storm[0] <= at <= storm[1]] or [0.0]
+    return {
+        'mode': 'offloaded' if offload else 'inline',
+        'logins': logins,
+        'storm_seconds': round(storm[1] - storm[0], 3),
+        'quiet_p50_ms': round(statistics.median(quiet), 2),
+        'storm_p50_ms': round(statistics.median(during), 2),
+        'storm_p99_ms': round(percentile(during, 99), 2),
+        'storm_max_ms': round(max(during), 2),
+        'pool_wait_max_ms': pool_stats['wait_max_ms'],
+        'pool_timeouts': pool_stats['timeouts'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=50, help='concurrent logins in the storm')
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt work factor of the stored hashes')
+    parser.add_argument('--interval', type=float, default=0.01, help='seconds between chat messages')
+    parser.add_argument('--duration', type=float, default=None, help='seconds per mode (default: long enough for the storm)')
+    parser.add_argument('--max-pool-wait-ms', type=float, default=100, help='fail if an offloaded-mode pool checkout waits longer')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    app.config['BCRYPT_ROUNDS'] = args.rounds
+    server.limiter.enabled = False  # Every login comes from 127.0.0.1 and would hit the /login limit
+    # The pinger sends far faster than a person; otherwise most pings only measure the rate_limited reply
+    app.config['SOCKET_RATE_LIMITS'] = {group: (1e9, 1e9) for group in app.config['SOCKET_RATE_LIMITS']}
+    setup_users(args.logins, args.rounds)
+    # Rough per-hash cost so the storm fits in the window even when logins run one at a time
+    started = perf_counter()
+    bcrypt.hashpw(b'x', bcrypt.gensalt(rounds=args.rounds))
+    duration = args.duration or max(2.0, 2 * args.logins * (perf_counter() - started))
+
+    results = [run_mode(False, args.logins, args.interval, duration),
+               run_mode(True, args.logins, args.interval, duration)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<10} {'logins':>6} {'storm s':>8} {'quiet p50':>10} {'storm p50':>10} {'storm p99':>10} "
+              f"{'storm max':>10} {'pool wait max':>14}")
+        for r in results:
+            print(f"{r['mode']:<10} {r['logins']:>6} {r['storm_seconds']:>8} {r['quiet_p50_ms']:>10} "
+                  f"{r['storm_p50_ms']:>10} {r['storm_p99_ms']:>10} {r['storm_max_ms']:>10} {r['pool_wait_max_ms']:>14}")
+
+    offloaded = results[1]
+    assert offloaded['pool_timeouts'] == 0 and offloaded['pool_wait_max_ms'] <= args.max_pool_wait_ms, \
+        f"logins held pooled connections: longest checkout wait {offloaded['pool_wait_max_ms']} ms, {offloaded['pool_timeouts']} timeouts"
+
+if __name__ == '__main__':
+    main()
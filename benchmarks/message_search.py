@@ -0,0 +1,88 @@
+# Message search latency on a synthetic history: the local FTS5 index used by server.search_messages
+# against the LIKE '%term%' scan it replaces. Words follow a Zipf-like distribution, so queries
+# mix rare and very common terms. Uses a throwaway SQLite database and index file.
+#
+#   python benchmarks/message_search.py --messages 200000 --queries 200
+#   python benchmarks/message_search.py --messages 1000000 --json results.json
+import argparse, os, sys, tempfile, random, json
+from itertools import accumulate
+from time import perf_counter
+
+WORK_DIR = tempfile.mkdtemp(prefix='chat-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORK_DIR, 'bench.db')}"
+os.environ['SEARCH_BACKEND'] = 'local'
+os.environ['SEARCH_INDEX_PATH'] = os.path.join(WORK_DIR, 'search.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+from server import app, db, User, Message
+
+VOCABULARY = [f"w{i:05d}" for i in range(20000)]
+CUM_WEIGHTS = list(accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+def populate(count, seed):
+    rnd = random.Random(seed)
+    with app.app_context():
+        server.apply_migrations()
+        db.session.add(User(username='bench', email='bench@bench.local', password_hash='x'))
+        db.session.commit()
+        for start in range(0, count, 10000):
+            rows = [{'user_id': 1, 'content': ' '.join(rnd.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=rnd.randint(3, 30)))}
+                    for _ in range(min(10000, count - start))]
+            db.session.execute(Message.__table__.insert(), rows)
+            db.session.commit()
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def time_queries(search, queries):
+    samples = []
+    for query in queries:
+        started = perf_counter()
+        search(query)
+        samples.append((perf_counter() - started) * 1000)
+    return samples
+
+def like_search(query):
+    stmt = db.select(Message.message_id).order_by(Message.message_id.desc()).limit(20)
+    for term in query.split():
+        stmt = stmt.where(Message.content.like(f'%{term}%'))
+    return db.session.execute(stmt).all()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=200000, help='messages in the history')
+    parser.add_argument('--queries', type=int, default=200, help='timed queries per method')
+    parser.add_argument('--like-queries', type=int, default=20, help='timed LIKE scans (each reads the whole table)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    populate(args.messages, args.seed)
+    rnd = random.Random(args.seed + 1)
+    queries = [' '.join(rnd.choices(VOCABULARY[:2000], k=rnd.randint(1, 2))) for _ in range(args.queries)]
+
+    with app.app_context():
+        started = perf_counter()
+        server.search_index.backfill()
+        build_seconds = perf_counter() - started
+        indexed = time_queries(lambda q: server.search_messages(q), queries)
+        scanned = time_queries(like_search, queries[:args.like_queries])
+
+    results = {
+        'messages': args.messages,
+        'index_build_s': round(build_seconds, 2),
+        'index_p50_ms': round(percentile(indexed, 50), 3),
+        'index_p99_ms': round(percentile(indexed, 99), 3),
+        'like_p50_ms': round(percentile(scanned, 50), 3),
+        'like_p99_ms': round(percentile(scanned, 99), 3),
+    }
+    for name, value in results.items():
+        print(f"{name:<16} {value}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Encode cost of the Socket.IO packets the chat sends most: a live message and a history page.
+# Each payload is encoded the way python-socketio does by default (standard library json), through
+# server.SocketPacket/SocketJSON (orjson when installed), and pre-encoded: broadcast() encodes a
+# payload once, history pages are assembled from the encodings kept with the hot history. Reports
+# µs per packet and bytes per message; the decoded packets are checked to be identical.
+#
+#   python benchmarks/payload_encoding.py --page-size 50 --json results.json
+import argparse, os, sys, tempfile, random, json
+from time import perf_counter
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='chat-bench-'), 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from socketio import packet
+import server
+
+WORDS = (
+    "hey hi hello lol ok yeah thanks gg brb idk the a to and of is it you that in was for on are "
+    "with as at be this have from or one what all were we when your can there use an each which "
+    "how if will up other about out many then so some would make like into time look more see "
+    "🙂 😂 👍 ünïcødé 日本語 \"quoted\" https://criticalfailcoding.com/chat"
+).split()
+COLORS = ['#00D0E0', '#00D0F0', '#00E000', '#00E060', '#CBCC32', '#99D65B', '#26D8D8']
+
+def build_messages(count, seed):
+    rnd = random.Random(seed)
+    return [{
+        'message_id': 100000 + i,
+        'room_id': 1,
+        'username': f"User-{rnd.randint(1000, 9999)}",
+        'message': ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 30))),
+        'color': rnd.choice(COLORS),
+        'timestamp': f"{rnd.randint(1, 12):02}:{rnd.randint(0, 59):02}:{rnd.randint(0, 59):02} PM",
+        'edited_at': None
+    } for i in range(count)]
+
+def encode_packet(packet_class, codec, event, payload):
+    pkt = packet_class(packet.EVENT, namespace='/', data=[event, payload])
+    pkt.json = codec
+    return pkt.encode()
+
+def time_encode(encode, repeat):
+    best = None
+    for _ in range(repeat):
+        started = perf_counter()
+        encoded = encode()
+        elapsed = perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, encoded
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=1000, help='live messages encoded per pass')
+    parser.add_argument('--page-size', type=int, default=50, help='messages per history page')
+    parser.add_argument('--pages', type=int, default=200, help='history pages encoded per pass')
+    parser.add_argument('--repeat', type=int, default=5, help='timed passes per case, best is reported')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    messages = build_messages(args.messages, args.seed)
+    page_messages = messages[:args.page_size]
+    page = {'room_id': 1, 'messages': page_messages, 'cursor': server.encode_history_cursor(100000), 'has_more': True}
+    # As kept by the hot history, with one older message so the page has more to load
+    hot_entries = [server.PreEncoded(message) for message in [dict(messages[0], message_id=99999)] + page_messages]
+
+    codec = server.socket_json
+    cases = [  # (name, packet class, json module, live payload, page payload)
+        ('python-socketio default', packet.Packet, json, lambda message: message, lambda: page),
+        (f'SocketJSON ({codec.name})', server.SocketPacket, codec, lambda message: message, lambda: page),
+        # Includes building the page (sorting, signing the cursor) from the hot entries
+        (f'pre-encoded ({codec.name})', server.SocketPacket, codec, server.PreEncoded,
+         lambda: server.history_page(1, hot_entries, args.page_size)),
+    ]
+
+    results = []
+    expected = None
+    for name, packet_class, codec, live_payload, page_payload in cases:
+        live_seconds, live_packets = time_encode(
+            lambda: [encode_packet(packet_class, codec, 'message', live_payload(message)) for message in messages], args.repeat)
+        page_seconds, page_packets = time_encode(
+            lambda: [encode_packet(packet_class, codec, 'chat_history', page_payload()) for _ in range(args.pages)], args.repeat)
+        page_packet = page_packets[0]
+        decoded = ([json.loads(p[1:]) for p in live_packets], json.loads(page_packet[1:])[1]['messages'])
+        if expected is None:
+            expected = decoded
+        assert decoded == expected, name
+        results.append({
+            'serializer': name,
+            'message_us': round(live_seconds * 1e6 / len(messages), 2),
+            'message_bytes': round(sum(len(p.encode()) for p in live_packets) / len(messages), 1),
+            'page_us': round(page_seconds * 1e6 / args.pages, 1),
+            'page_bytes_per_message': round(len(page_packet.encode()) / len(page_messages), 1),
+        })
+
+    print(f"{'serializer':<26} {'message µs':>11} {'message B':>10} {'page µs':>9} {'page B/msg':>11}")
+    for result in results:
+        print(f"{result['serializer']:<26} {result['message_us']:>11} {result['message_bytes']:>10} "
+              f"{result['page_us']:>9} {result['page_bytes_per_message']:>11}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
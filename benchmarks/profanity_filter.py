@@ -0,0 +1,89 @@
+# Compares the censor used by server.py against stock better_profanity on a synthetic chat
+# corpus: short messages, mentions, URLs, emoji/unicode, and a share of leetspeak and
+# multi-word profanity. Every message is checked for identical output before timing.
+#
+#   python benchmarks/profanity_filter.py --messages 500 --json results.json
+import argparse, os, sys, tempfile, random, json
+from time import perf_counter
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='chat-bench-'), 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from better_profanity import Profanity
+from better_profanity.utils import read_wordlist
+import server
+
+CHAT_WORDS = (
+    "hey hi hello lol lmao ok okay yeah nah thanks thx gg wp brb afk idk tbh the a to and of is it "
+    "you that in was for on are with as at be this have from or one had by word but not what all "
+    "were we when your can said there use an each which she do how their if will up other about "
+    "out many then them these so some her would make like him into time has look two more go see "
+    "assess classic grass shitake scunthorpe cocktail therapist 🙂 😂 👍 ünïcødé 日本語 !!! ?? ..."
+).split()
+LINKS = ['https://criticalfailcoding.com/chat', 'www.example.com/a?b=c', '@bob', '@coloredinchris']
+LEET = {'a': '@4', 'i': '1!', 'o': '0', 'e': '3', 's': '$5', 't': '7'}
+
+def leetify(rnd, word):
+    return ''.join(rnd.choice(LEET[c]) if c in LEET and rnd.random() < 0.3 else c for c in word)
+
+def build_corpus(count, profanity_rate, seed):
+    rnd = random.Random(seed)
+    bad_words = sorted(read_wordlist(Profanity()._default_wordlist_filename))
+    corpus = []
+    for _ in range(count):
+        words = []
+        for _ in range(rnd.randint(1, 24)):
+            roll = rnd.random()
+            if roll < profanity_rate:
+                words.append(leetify(rnd, rnd.choice(bad_words)))
+            elif roll < profanity_rate + 0.03:
+                words.append(rnd.choice(LINKS))
+            else:
+                word = rnd.choice(CHAT_WORDS)
+                words.append(word.capitalize() if rnd.random() < 0.1 else word)
+        corpus.append(' '.join(words) + rnd.choice(['', '', '.', '!', '?', ' :)']))
+    return corpus
+
+def time_censor(censor, corpus, repeat):
+    best = None
+    for _ in range(repeat):
+        started = perf_counter()
+        for message in corpus:
+            censor(message)
+        elapsed = perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=500, help='messages in the corpus')
+    parser.add_argument('--profanity-rate', type=float, default=0.02, help='share of words taken from the word list')
+    parser.add_argument('--repeat', type=int, default=3, help='timed passes of the server censor, best is reported')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages, args.profanity_rate, args.seed)
+    stock = Profanity()
+    for message in corpus:
+        assert server.profanity.censor(message) == stock.censor(message), message
+    chars = sum(len(message) for message in corpus)
+
+    stock_seconds = time_censor(stock.censor, corpus, 1)  # ~1ms per character, one pass is plenty
+    fast_seconds = time_censor(server.profanity.censor, corpus, args.repeat)
+    results = {
+        'messages': len(corpus),
+        'chars': chars,
+        'better_profanity_ns_per_char': round(stock_seconds * 1e9 / chars, 1),
+        'server_ns_per_char': round(fast_seconds * 1e9 / chars, 1),
+        'speedup': round(stock_seconds / fast_seconds, 1),
+    }
+
+    for name, value in results.items():
+        print(f"{name:<30} {value}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
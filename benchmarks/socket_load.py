@@ -0,0 +1,405 @@
+# Socket.IO load test for server.py. Starts the server in a child process (SQLite by default,
+# --url for MySQL), then drives simulated clients through connect -> request_username -> join a
+# room -> message/edit -> disconnect over real WebSockets. Reports end-to-end delivery latency
+# (sender's emit to each receiver's event), messages/s, and the server's RSS and CPU time.
+#
+# Clients speak the Engine.IO 4 / Socket.IO 5 wire protocol directly, so only the packages the
+# server already needs are required. All clients run as greenlets in this process, which shares
+# one clock for the latency measurements; at high client counts this process's CPU becomes the
+# limit, so keep an eye on the "client_cpu_s" figure.
+#
+#   python benchmarks/socket_load.py --clients 1000 --rooms 50 --duration 30 --json run.json
+#   python benchmarks/socket_load.py --clients 1000 --rooms 50 --duration 30 --compare run.json
+import eventlet
+eventlet.monkey_patch()
+
+import argparse, os, sys, tempfile, json, socket, subprocess, resource, platform, random, http.client
+from datetime import datetime, timezone
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 3)
+
+# Server process
+
+def serve(args):
+    import server
+    from server import app, db, socketio, User, Room
+
+    with app.app_context():
+        server.apply_migrations()
+        existing = {name for (name,) in db.session.query(User.username)}
+        db.session.add_all(User(username=f'load{i}', email=f'load{i}@bench.local', password_hash='x')
+                           for i in range(args.clients) if f'load{i}' not in existing)
+        rooms = {name for (name,) in db.session.query(Room.name)}
+        db.session.add_all(Room(name=f'load-{i}') for i in range(args.rooms) if f'load-{i}' not in rooms)
+        db.session.commit()
+    if args.no_rate_limits:
+        app.config['SOCKET_RATE_LIMITS'] = {group: (1e9, 1e9) for group in app.config['SOCKET_RATE_LIMITS']}
+    app.config.update(parse_overrides(args.config))
+    socketio.run(app, host='127.0.0.1', port=args.port, log_output=False)
+
+def parse_overrides(pairs):
+    # KEY=VALUE pairs for app.config; values are JSON (true, 200, "text") or plain strings
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition('=')
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    return overrides
+
+def start_server(args, work_dir):
+    port = args.port or free_port()
+    env = dict(os.environ, LOG_LEVEL='WARNING', SEARCH_INDEX_PATH=os.path.join(work_dir, 'search.db'),
+               DATABASE_URL=args.url or f"sqlite:///{os.path.join(work_dir, 'bench.db')}")
+    command = [sys.executable, os.path.abspath(__file__), '--serve', '--port', str(port),
+               '--clients', str(args.clients), '--rooms', str(args.rooms)]
+    if args.no_rate_limits:
+        command.append('--no-rate-limits')
+    for pair in args.config:
+        command += ['--config', pair]
+    log_path = os.path.join(work_dir, 'server.log')
+    process = subprocess.Popen(command, env=env, cwd=work_dir, stdout=open(log_path, 'w'), stderr=subprocess.STDOUT)
+
+    deadline = perf_counter() + 60
+    while perf_counter() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"Server exited during startup, see {log_path}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process, port, log_path
+        except OSError:
+            sleep(0.2)
+    process.kill()
+    sys.exit(f"Server did not start listening, see {log_path}")
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def read_rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def read_cpu_seconds(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS  # utime + stime
+
+# Clients
+
+class Stats:
+    def __init__(self):
+        self.message_ms = []
+        self.edit_ms = []
+        self.join_ms = []
+        self.sent = 0
+        self.edits = 0
+        self.delivered = 0
+        self.expected = 0
+        self.rate_limited = 0
+        self.errors = []
+        self.measuring = False
+
+class LoadClient:
+    """One simulated user speaking Socket.IO over a WebSocket."""
+
+    def __init__(self, index, room_id, args, stats, ready, go):
+        self.name = f'load{index}'
+        self.room_id = room_id
+        self.args = args
+        self.stats = stats
+        self.ready = ready
+        self.go = go
+        self.ws = None
+        self.last_message_id = None
+
+    def emit(self, event, data):
+        self.ws.send('42' + json.dumps([event, data]))
+
+    def receive(self, timeout=None):
+        # Returns (event, data) for Socket.IO events, answers pings, None when nothing arrived
+        packet = self.ws.receive(timeout=timeout)
+        if packet is None:
+            return None
+        if packet == '2':
+            self.ws.send('3')
+            return None
+        if packet.startswith('42'):
+            event, *payload = json.loads(packet[2:])
+            return event, (payload[0] if payload else None)
+        if packet.startswith('44'):
+            raise RuntimeError(f"Connection refused: {packet[2:]}")
+        return packet[:2], None
+
+    def wait_for(self, wanted, predicate=lambda data: True):
+        deadline = perf_counter() + self.args.timeout
+        while True:
+            if perf_counter() > deadline:
+                raise TimeoutError(f"No {wanted} within {self.args.timeout}s")
+            received = self.receive(timeout=max(0, deadline - perf_counter()))
+            if received is None:
+                continue
+            event, data = received
+            if event == wanted and predicate(data):
+                return data
+            self.handle(event, data)
+
+    def handle(self, event, data):
+        now = perf_counter()
+        if event == 'message' and data.get('room_id') == self.room_id and data['message'].startswith('load '):
+            if data['username'] == self.name:
+                self.last_message_id = data['message_id']
+            if self.stats.measuring:
+                self.stats.message_ms.append((now - float(data['message'].split()[1])) * 1000)
+                self.stats.delivered += 1
+        elif event == 'message_edited' and data.get('room_id') == self.room_id and data['new_content'].startswith('load '):
+            if self.stats.measuring:
+                self.stats.edit_ms.append((now - float(data['new_content'].split()[1])) * 1000)
+        elif event == 'rate_limited':
+            self.stats.rate_limited += 1
+
+    def connect(self, port):
+        # Opens the Engine.IO session over long-polling and upgrades it to a WebSocket, like
+        # socket.io-client does. Connecting straight over a WebSocket would have the server's open
+        # packet arrive with the handshake response, which simple_websocket only notices on its
+        # next read.
+        import simple_websocket
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=self.args.timeout)
+        conn.request('GET', '/socket.io/?EIO=4&transport=polling')
+        body = conn.getresponse().read().decode()
+        conn.close()
+        sid = json.loads(body[body.index('{'):])['sid']
+        self.ws = simple_websocket.Client.connect(f'ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket&sid={sid}')
+        self.ws.send('2probe')
+        if self.ws.receive(timeout=self.args.timeout) != '3probe':
+            raise RuntimeError("WebSocket upgrade was not acknowledged")
+        self.ws.send('5')  # Upgrade done, polling is no longer used
+
+    def run(self, port, room_size):
+        try:
+            started = perf_counter()
+            self.connect(port)
+            self.ws.send('40' + json.dumps({'username': self.name}))  # Socket.IO connect with auth
+            while not (self.ws.receive(timeout=self.args.timeout) or '').startswith('40'):
+                pass
+
+            self.emit('request_username', {'custom': self.name})
+            self.wait_for('chat_history')
+            self.emit('join_room', {'room_id': self.room_id})
+            self.wait_for('chat_history', lambda page: page['room_id'] == self.room_id)
+            self.emit('leave_room', {'room_id': 1})  # Steady state traffic stays inside the load rooms
+            self.stats.join_ms.append((perf_counter() - started) * 1000)
+        except Exception as e:
+            self.stats.errors.append(f'join: {e!r}')
+            return
+        finally:
+            self.ready()
+
+        self.go.wait()
+        interval = 1 / self.args.rate
+        next_send = perf_counter() + random.uniform(0, interval)  # Spread clients over the interval
+        end = perf_counter() + self.args.duration
+        sent = 0
+        try:
+            while perf_counter() < end:
+                received = self.receive(timeout=max(0, min(next_send, end) - perf_counter()))
+                if received:
+                    self.handle(*received)
+                if perf_counter() >= next_send:
+                    next_send += interval
+                    sent += 1
+                    if self.args.edit_every and sent % self.args.edit_every == 0 and self.last_message_id:
+                        self.emit('edit_message', {'message_id': self.last_message_id, 'content': f'load {perf_counter():.6f} edited'})
+                        self.stats.edits += 1
+                    else:
+                        self.emit('message', {'message': f'load {perf_counter():.6f}', 'room_id': self.room_id})
+                        self.stats.sent += 1
+                        self.stats.expected += room_size
+            # Collect deliveries still in flight
+            drain_end = perf_counter() + self.args.drain
+            while perf_counter() < drain_end:
+                received = self.receive(timeout=max(0, drain_end - perf_counter()))
+                if received:
+                    self.handle(*received)
+        except Exception as e:
+            self.stats.errors.append(f'run: {e!r}')
+        finally:
+            try:
+                self.ws.send('41')  # Socket.IO disconnect
+                self.ws.close()
+            except Exception:
+                pass
+
+class Countdown:
+    def __init__(self, count):
+        self.remaining = count
+        self.done = eventlet.event.Event()
+
+    def __call__(self):
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.done.send()
+
+def run_clients(args, port, server_pid):
+    stats = Stats()
+    room_ids = list(range(2, args.rooms + 2))  # 1 is "general", the load rooms were created after it
+    room_sizes = {room_id: 0 for room_id in room_ids}
+    assignments = [room_ids[i % len(room_ids)] for i in range(args.clients)]
+    for room_id in assignments:
+        room_sizes[room_id] += 1
+
+    ready = Countdown(args.clients)
+    go = eventlet.event.Event()
+    pool = eventlet.GreenPool(args.clients + 1)
+    rss_samples = []
+
+    def sample_server():
+        while True:
+            rss_samples.append(read_rss_mb(server_pid))
+            eventlet.sleep(0.5)
+
+    sampler = eventlet.spawn(sample_server)
+    idle_rss = read_rss_mb(server_pid)
+    client_cpu = os.times()
+    ramp_started = perf_counter()
+    clients = [LoadClient(i, assignments[i], args, stats, ready, go) for i in range(args.clients)]
+    for client in clients:
+        pool.spawn(client.run, port, room_sizes[client.room_id])
+        eventlet.sleep(args.ramp / args.clients)
+    ready.done.wait()
+    ramp_seconds = perf_counter() - ramp_started
+    joined_rss = read_rss_mb(server_pid)
+
+    server_cpu = read_cpu_seconds(server_pid)
+    stats.measuring = True
+    go.send()
+    pool.waitall()
+    server_cpu = read_cpu_seconds(server_pid) - server_cpu
+    client_cpu_s = sum(os.times()[:2]) - sum(client_cpu[:2])
+    sampler.kill()
+
+    return {
+        'clients_joined': len(stats.join_ms),
+        'errors': len(stats.errors),
+        'error_samples': stats.errors[:5],
+        'ramp_s': round(ramp_seconds, 2),
+        'join_p50_ms': percentile(stats.join_ms, 50),
+        'join_p99_ms': percentile(stats.join_ms, 99),
+        'messages_sent': stats.sent,
+        'edits_sent': stats.edits,
+        'messages_per_s': round(stats.sent / args.duration, 1),
+        'deliveries_per_s': round(stats.delivered / args.duration, 1),
+        'delivery_ratio': round(stats.delivered / stats.expected, 4) if stats.expected else None,
+        'message_p50_ms': percentile(stats.message_ms, 50),
+        'message_p99_ms': percentile(stats.message_ms, 99),
+        'message_max_ms': percentile(stats.message_ms, 100),
+        'edit_p50_ms': percentile(stats.edit_ms, 50),
+        'edit_p99_ms': percentile(stats.edit_ms, 99),
+        'rate_limited': stats.rate_limited,
+        'server_rss_idle_mb': round(idle_rss, 1),
+        'server_rss_joined_mb': round(joined_rss, 1),
+        'server_rss_peak_mb': round(max(rss_samples + [joined_rss]), 1),
+        'server_cpu_s': round(server_cpu, 2),
+        'client_cpu_s': round(client_cpu_s, 2),
+    }
+
+# Reporting
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def print_results(results, baseline=None):
+    print(f"{'metric':<24} {'value':>12}" + (f" {'baseline':>12} {'change':>9}" if baseline else ''))
+    for name, value in results.items():
+        if isinstance(value, list):
+            continue
+        line = f"{name:<24} {value!s:>12}"
+        if baseline:
+            before = baseline.get(name)
+            change = ''
+            if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+                change = f"{(value - before) / before * 100:+.1f}%"
+            line += f" {before!s:>12} {change:>9}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=500, help='simulated users')
+    parser.add_argument('--rooms', type=int, default=25, help='rooms the users are spread over')
+    parser.add_argument('--rate', type=float, default=0.5, help='messages per second per client')
+    parser.add_argument('--edit-every', type=int, default=5, help='every Nth send edits the previous message (0: never)')
+    parser.add_argument('--duration', type=float, default=20, help='seconds of steady traffic')
+    parser.add_argument('--ramp', type=float, default=10, help='seconds over which clients connect')
+    parser.add_argument('--drain', type=float, default=2, help='seconds to wait for in-flight deliveries')
+    parser.add_argument('--timeout', type=float, default=30, help='seconds a client waits for a reply while joining')
+    parser.add_argument('--no-rate-limits', action='store_true', help="lift the server's socket rate limits")
+    parser.add_argument('--config', action='append', default=[], metavar='KEY=VALUE',
+                        help='override a server app.config value, e.g. MESSAGE_WRITE_BEHIND=true (repeatable)')
+    parser.add_argument('--url', help='database for the server (default: a throwaway SQLite file)')
+    parser.add_argument('--port', type=int, help='port for the server (default: any free port)')
+    parser.add_argument('--json', help='write the config and results to this file')
+    parser.add_argument('--compare', help='results file of an earlier run to compare against')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)  # Child process mode
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    if args.serve:
+        serve(args)
+        return
+
+    commit = git_commit()  # Before any sockets are open; green subprocess pipes can't reuse their fds
+    work_dir = tempfile.mkdtemp(prefix='chat-bench-')
+    process, port, log_path = start_server(args, work_dir)
+    try:
+        results = run_clients(args, port, process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+
+    config = {name: value for name, value in vars(args).items() if name not in ('json', 'compare', 'serve', 'port')}
+    config['url'] = 'sqlite' if not args.url else args.url.split('://', 1)[0]
+    report = {
+        'benchmark': 'socket_load',
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'config': config,
+        'results': results,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if previous.get('config') != config:
+            print("[WARN] The baseline was run with a different configuration")
+        baseline = previous['results']
+    print_results(results, baseline)
+    if results['errors']:
+        print(f"[WARN] {results['errors']} clients failed, e.g. {results['error_samples'][0]}; server log: {log_path}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -12,14 +12,31 @@ CREATE TABLE Users (
     last_login TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
+-- Rooms table (Chat channels; every message belongs to one)
+CREATE TABLE Rooms (
+    room_id INT PRIMARY KEY AUTO_INCREMENT,
+    name VARCHAR(50) UNIQUE NOT NULL,
+    created_by INT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (created_by) REFERENCES Users(user_id) ON DELETE SET NULL
+);
+
+INSERT INTO Rooms (room_id, name) VALUES (1, 'general');
+
 -- Messages table (Stores real-time chat messages)
 CREATE TABLE Messages (
     message_id INT PRIMARY KEY AUTO_INCREMENT,
     user_id INT NOT NULL,
+    room_id INT NOT NULL DEFAULT 1,
     content TEXT NOT NULL,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     edited_at TIMESTAMP NULL,
-    FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+    INDEX idx_messages_timestamp (timestamp, message_id),
+    INDEX idx_messages_user_id (user_id, message_id),
+    INDEX idx_messages_room_id (room_id, message_id),
+    FULLTEXT INDEX ft_messages_content (content),
+    FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (room_id) REFERENCES Rooms(room_id)
 );
 
 -- Moderators table (Tracks users with moderation rights)
@@ -36,6 +53,36 @@ CREATE TABLE Banned_Users (
     banned_by INT NULL,
     ban_reason TEXT NOT NULL,
     ban_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_banned_users_banned_by (banned_by, ban_date),
     FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE,
     FOREIGN KEY (banned_by) REFERENCES Users(user_id) ON DELETE SET NULL
 );
+
+-- Uploads table (Maps shared file names and uploaders to content-addressed blobs)
+CREATE TABLE Uploads (
+    upload_id INT PRIMARY KEY AUTO_INCREMENT,
+    sha256 CHAR(64) NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    size BIGINT NOT NULL,
+    user_id INT NOT NULL,
+    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_uploads_sha256 (sha256),
+    FOREIGN KEY (user_id) REFERENCES Users(user_id) ON DELETE CASCADE
+);
+
+-- Rate limit tables (Shared Flask-Limiter storage, used when RATELIMIT_STORAGE_URI=sqlalchemy://)
+CREATE TABLE RateLimitCounters (
+    `key` VARCHAR(255) PRIMARY KEY,
+    count INT NOT NULL DEFAULT 0,
+    expires_at DOUBLE NOT NULL,
+    INDEX idx_rate_limit_counters_expires_at (expires_at)
+);
+
+CREATE TABLE RateLimitHits (
+    hit_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    `key` VARCHAR(255) NOT NULL,
+    hit_at DOUBLE NOT NULL,
+    expires_at DOUBLE NOT NULL,
+    INDEX idx_rate_limit_hits_key_hit_at (`key`, hit_at),
+    INDEX idx_rate_limit_hits_expires_at (expires_at)
+);
@@ -4,7 +4,7 @@ import { formatMessage } from "./ColorUtils";
 import "../styles/ChatRoom.css";
 import { socket } from "../hooks/useChatSocket"; // You already import socket elsewhere, match your structure
 
-const ChatBubble = ({ msg, username, userColors, darkMode }) => {
+const ChatBubble = ({ msg, username, userColors, validUsernames, darkMode }) => {
   const normalizedUsername = msg.username.toLowerCase();
   const userColor = darkMode
     ? userColors[normalizedUsername]?.darkColor || "#888"
@@ -84,13 +84,30 @@ const [editContent, setEditContent] = useState(msg.message);
         </div>
       ) : (
         <>
-          {msg.file_url ? (
+          {msg.file_url && msg.preview?.type === "text" ? (
             <a href={msg.file_url} target="_blank" rel="noopener noreferrer">
-              {/* File previews */}
-              {/\.(jpg|jpeg|png|gif|webp|bmp|svg|tiff|ico)$/i.test(msg.file_url) ? (
-                <img src={msg.file_url} alt={msg.message} className="chat-image" />
+              <span className="highlight-file">{msg.message}</span>
+              <pre className="chat-text-preview">
+                {msg.preview.text}
+                {msg.preview.truncated && "\n…"}
+              </pre>
+            </a>
+          ) : msg.file_url ? (
+            <a href={msg.file_url} target="_blank" rel="noopener noreferrer">
+              {/* File previews. Server-made thumbnails and posters replace the full file; while
+                  one is being made, nothing is downloaded. */}
+              {/\.(jpg|jpeg|png|gif|webp|bmp|svg|tiff|ico)$/i.test(msg.file_url) && msg.preview_pending ? (
+                <span className="highlight-file">{msg.message}</span>
+              ) : /\.(jpg|jpeg|png|gif|webp|bmp|svg|tiff|ico)$/i.test(msg.file_url) ? (
+                <img src={msg.preview?.url || msg.file_url} alt={msg.message} className="chat-image" loading="lazy" />
               ) : /\.(mp4|webm|ogg|ogv|mov|avi|mkv)$/i.test(msg.file_url) ? (
-                <video src={msg.file_url} controls className="chat-video" />
+                <video
+                  src={msg.file_url}
+                  poster={msg.preview?.url}
+                  preload={msg.preview || msg.preview_pending ? "none" : "metadata"}
+                  controls
+                  className="chat-video"
+                />
               ) : /\.(mp3|wav|oga|flac|m4a|aac)$/i.test(msg.file_url) ? (
                 <audio src={msg.file_url} controls className="chat-audio" />
               ) : (
@@ -100,7 +117,7 @@ const [editContent, setEditContent] = useState(msg.message);
           ) : (
             <span
               className="message-text"
-              dangerouslySetInnerHTML={{ __html: formatMessage(msg) }}
+              dangerouslySetInnerHTML={{ __html: formatMessage(msg, validUsernames) }}
             />
           )}
           {msg.username === username && !msg.file_url && (
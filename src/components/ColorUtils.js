@@ -18,11 +18,11 @@ export const getAdjustedColor = (baseColor, isDarkMode) => {
       : usernameColorMap[baseColor]?.light || baseColor;
   };
   
-  export const formatMessage = (msg) => {
+  export const formatMessage = (msg, validUsernames = []) => {
     let messageContent = msg.message || msg.content || "";
   
     messageContent = messageContent.replace(/@([^\s]+)/g, (match, username) => {
-      if (msg.validUsernames?.includes(username)) {
+      if (validUsernames.includes(username)) {
         return `<span class="highlight-mention">@${username}</span>`;
       }
       return match;
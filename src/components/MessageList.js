@@ -3,23 +3,32 @@ import React, { useEffect, useRef } from "react";
 import ChatBubble from "./ChatBubble";
 import "../styles/ChatRoom.css";
 
-const MessageList = ({ messages, username, userColors, darkMode, handleTextHighlight }) => {
+const MessageList = ({ messages, username, userColors, validUsernames, darkMode, handleTextHighlight, onLoadOlder }) => {
   const messagesRef = useRef(null);
+  const lastMessage = messages[messages.length - 1];
 
+  // Only stick to the bottom when a new message arrives, not when older history is prepended
   useEffect(() => {
     if (messagesRef.current) {
       messagesRef.current.scrollTop = messagesRef.current.scrollHeight;
     }
-  }, [messages]);
+  }, [lastMessage]);
+
+  const handleScroll = () => {
+    if (onLoadOlder && messagesRef.current && messagesRef.current.scrollTop === 0) {
+      onLoadOlder();
+    }
+  };
 
   return (
-    <div id="messages" className="messages" ref={messagesRef} onMouseUp={handleTextHighlight}>
+    <div id="messages" className="messages" ref={messagesRef} onMouseUp={handleTextHighlight} onScroll={handleScroll}>
       {messages.map((msg, idx) => (
         <ChatBubble
           key={idx}
           msg={msg}
           username={username}
           userColors={userColors}
+          validUsernames={validUsernames}
           darkMode={darkMode}
         />
       ))}
@@ -0,0 +1,89 @@
+// src/components/SearchPanel.js
+import React, { useEffect, useState } from "react";
+import "../styles/ChatRoom.css";
+
+// Results are ranked by the server; the cursor continues from the last hit shown
+const fetchSearchPage = async (query, roomId, cursor) => {
+  const params = new URLSearchParams({ q: query });
+  if (roomId !== null && roomId !== undefined) params.set("room_id", roomId);
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`http://localhost:5000/search?${params}`, { credentials: "include" });
+  return res.json();
+};
+
+// Wraps the [start, end) ranges the server matched in <mark>; React escapes the message text itself
+const renderSnippet = (snippet, highlights) => {
+  const parts = [];
+  let last = 0;
+  highlights.forEach(([start, end], idx) => {
+    if (start > last) parts.push(snippet.slice(last, start));
+    parts.push(<mark key={idx}>{snippet.slice(start, end)}</mark>);
+    last = end;
+  });
+  parts.push(snippet.slice(last));
+  return parts;
+};
+
+const SearchPanel = ({ roomId, darkMode }) => {
+  const [query, setQuery] = useState("");
+  const [results, setResults] = useState([]);
+  const [cursor, setCursor] = useState(null);
+  const [error, setError] = useState("");
+
+  const runSearch = async (q, nextCursor) => {
+    try {
+      const data = await fetchSearchPage(q, roomId, nextCursor);
+      if (data.error) {
+        setError(data.error);
+        return;
+      }
+      setError("");
+      setResults((prev) => (nextCursor ? [...prev, ...data.results] : data.results));
+      setCursor(data.has_more ? data.cursor : null);
+    } catch (err) {
+      console.error("Error searching messages:", err);
+    }
+  };
+
+  // Search a moment after the user stops typing
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setResults([]);
+      setCursor(null);
+      return;
+    }
+    const timer = setTimeout(() => runSearch(q, null), 300);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [query, roomId]);
+
+  return (
+    <div className={`search-panel ${darkMode ? "dark-mode" : ""}`}>
+      <input
+        type="search"
+        placeholder="Search messages"
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+      />
+      {error && <div className="search-error">{error}</div>}
+      {results.length > 0 && (
+        <ul className="search-results">
+          {results.map((hit) => (
+            <li key={hit.message_id}>
+              <span className="search-meta">{hit.username} · {hit.timestamp}</span>
+              <span>{renderSnippet(hit.snippet, hit.highlights)}</span>
+            </li>
+          ))}
+        </ul>
+      )}
+      {cursor && (
+        <button className="load-more" onClick={() => runSearch(query.trim(), cursor)}>
+          Load more
+        </button>
+      )}
+    </div>
+  );
+};
+
+export default SearchPanel;
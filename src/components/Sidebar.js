@@ -3,9 +3,34 @@ import React from "react";
 import UserContextMenu from "./UserContextMenu";
 import "../styles/ChatRoom.css";
 
-const Sidebar = ({ onlineUsers, selectedUser, setSelectedUser, userColors, darkMode, sessionUsername, isModerator }) => {
+const Sidebar = ({
+  onlineUsers, selectedUser, setSelectedUser, userColors, darkMode, sessionUsername, isModerator,
+  rooms, currentRoom, onSelectRoom, onCreateRoom,
+}) => {
+  const handleCreateRoom = () => {
+    const name = prompt("Name of the new room:");
+    if (name && name.trim()) onCreateRoom(name.trim());
+  };
+
   return (
     <div className="sidebar">
+      <div className="sidebar-header">
+        <h2>Rooms</h2>
+      </div>
+      <div className="sidebar-content">
+        <ul className="room-list">
+          {rooms.map((room) => (
+            <li
+              key={room.room_id}
+              className={room.room_id === currentRoom ? "selected" : ""}
+              onClick={() => onSelectRoom(room.room_id)}
+            >
+              #{room.name}
+            </li>
+          ))}
+        </ul>
+        <button className="create-room" onClick={handleCreateRoom}>+ New room</button>
+      </div>
       <div className="sidebar-header">
         <h2>Online</h2>
       </div>
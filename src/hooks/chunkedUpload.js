@@ -0,0 +1,72 @@
+// src/hooks/chunkedUpload.js
+// Uploads a file in chunks so large files don't need one giant request and a dropped
+// connection only costs the chunk in flight.
+const API_URL = "http://localhost:5000";
+const MAX_RETRIES = 5;
+// Files up to this size are hashed up front so the server can skip ones it already stores
+const DEDUP_HASH_LIMIT = 64 * 1024 * 1024;
+
+const toHex = (buffer) =>
+  Array.from(new Uint8Array(buffer))
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+
+const postJson = async (url, body) => {
+  const res = await fetch(url, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    credentials: "include",
+    body: JSON.stringify(body),
+  });
+  const data = await res.json();
+  if (!res.ok) throw new Error(data.error || "Upload failed");
+  return data;
+};
+
+// Ask the server how much of the upload it actually stored
+const fetchReceived = async (uploadId) => {
+  try {
+    const res = await fetch(`${API_URL}/upload/${uploadId}`, { credentials: "include" });
+    return res.ok ? (await res.json()).received : null;
+  } catch (err) {
+    return null;
+  }
+};
+
+export const uploadFileInChunks = async (file, roomId, onProgress) => {
+  const sha256 =
+    file.size <= DEDUP_HASH_LIMIT
+      ? toHex(await crypto.subtle.digest("SHA-256", await file.arrayBuffer()))
+      : undefined;
+  const upload = await postJson(`${API_URL}/upload/initiate`, { filename: file.name, size: file.size, sha256, room_id: roomId });
+  if (upload.deduplicated) return upload;
+
+  let offset = 0;
+  let retries = 0;
+  while (offset < file.size) {
+    try {
+      const body = await file.slice(offset, offset + upload.chunk_size).arrayBuffer();
+      const digest = toHex(await crypto.subtle.digest("SHA-256", body));
+      const res = await fetch(`${API_URL}/upload/${upload.upload_id}/chunk?offset=${offset}`, {
+        method: "PUT",
+        headers: { "Content-Type": "application/octet-stream", "X-Chunk-SHA256": digest },
+        credentials: "include",
+        body,
+      });
+      const data = await res.json();
+      if (!res.ok) throw new Error(data.error || "Chunk upload failed");
+
+      offset = data.received;
+      retries = 0;
+      if (onProgress) onProgress(offset / file.size);
+    } catch (err) {
+      retries += 1;
+      if (retries > MAX_RETRIES) throw err;
+      await new Promise((resolve) => setTimeout(resolve, 1000 * retries));
+      const received = await fetchReceived(upload.upload_id);
+      if (received !== null) offset = received;
+    }
+  }
+
+  return postJson(`${API_URL}/upload/${upload.upload_id}/complete`, {});
+};
@@ -7,7 +7,15 @@ const useChatSocket = () => {
   const [username, setUsername] = useState("");
   const [hasJoined, setHasJoined] = useState(false);
   const [onlineUsers, setOnlineUsers] = useState([]);
+  const [validUsernames, setValidUsernames] = useState([]);
+  const [rooms, setRooms] = useState([]);
+  const [currentRoom, setCurrentRoom] = useState(null);
+  const currentRoomRef = useRef(null);
   const userColors = useRef({});
+  const historyCursor = useRef(null);
+  const usernameDirectory = useRef({ epoch: null, version: null });
+  const presence = useRef({ roomId: null, epoch: null, seq: null });
+  const loadingOlder = useRef(false);
 
   const handleJoin = (customName) => {
     if (!customName) return;
@@ -15,6 +23,51 @@ const useChatSocket = () => {
     setHasJoined(true);
   };
 
+  const loadOlderMessages = () => {
+    if (!historyCursor.current || loadingOlder.current) return;
+    loadingOlder.current = true;
+    socket.emit("load_older_messages", { cursor: historyCursor.current, room_id: currentRoomRef.current });
+  };
+
+  // Only one room is shown at a time, so switching leaves the old room's broadcasts
+  const switchRoom = (roomId) => {
+    const previous = currentRoomRef.current;
+    if (roomId === previous) return;
+    if (previous !== null) socket.emit("leave_room", { room_id: previous });
+    currentRoomRef.current = roomId;
+    setCurrentRoom(roomId);
+    historyCursor.current = null;
+    presence.current = { roomId: null, epoch: null, seq: null };
+    setMessages([]);
+    setOnlineUsers([]);
+    socket.emit("join_room", { room_id: roomId });
+  };
+
+  const fetchRooms = async () => {
+    try {
+      const res = await fetch("http://localhost:5000/rooms", { credentials: "include" });
+      const data = await res.json();
+      if (res.ok) setRooms(data.rooms);
+    } catch (err) {
+      console.error("Error fetching rooms:", err);
+    }
+  };
+
+  const createRoom = async (name) => {
+    const res = await fetch("http://localhost:5000/rooms", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      credentials: "include",
+      body: JSON.stringify({ name }),
+    });
+    const data = await res.json();
+    if (!res.ok) {
+      alert(data.error || "Failed to create room.");
+      return;
+    }
+    switchRoom(data.room_id);
+  };
+
   const fetchRegisteredUsers = async () => {
     console.log("[DEBUG] fetchRegisteredUsers called");
     try {
@@ -29,6 +82,7 @@ const useChatSocket = () => {
 
   useEffect(() => {
     const handleMessage = (data) => {
+      if (data.room_id !== currentRoomRef.current) return;
       const normalizedUsername = data.username.toLowerCase();
       if (!userColors.current[normalizedUsername]) {
         userColors.current[normalizedUsername] = {
@@ -68,6 +122,51 @@ const useChatSocket = () => {
       );
     };
 
+    // Previews are made after the upload is announced; match them to the bubble by file URL
+    const handleFilePreview = (data) => {
+      if (data.room_id !== currentRoomRef.current) return;
+      setMessages((prevMessages) =>
+        prevMessages.map((msg) =>
+          msg.file_url === data.file_url && msg.preview_pending
+            ? { ...msg, preview: data.preview, preview_pending: false }
+            : msg
+        )
+      );
+    };
+
+    const applyUsernameDeltas = (names, deltas) =>
+      deltas.reduce((acc, delta) => {
+        const rest = acc.filter(
+          (name) => name !== delta.username && name !== delta.old_username
+        );
+        return delta.op === "delete" ? rest : [...rest, delta.username];
+      }, names);
+
+    const requestUsernameDirectory = () => {
+      const { epoch, version } = usernameDirectory.current;
+      socket.emit("request_username_directory", { epoch, since: version });
+    };
+
+    const handleUsernameDirectory = (directory) => {
+      usernameDirectory.current = { epoch: directory.epoch, version: directory.version };
+      if (directory.usernames) {
+        setValidUsernames(directory.usernames);
+      } else {
+        setValidUsernames((prev) => applyUsernameDeltas(prev, directory.deltas));
+      }
+    };
+
+    const handleUsernameDirectoryDelta = (delta) => {
+      const { epoch, version } = usernameDirectory.current;
+      if (version === null) return; // No snapshot yet; it will include this change
+      if (delta.epoch !== epoch || delta.version !== version + 1) {
+        requestUsernameDirectory(); // Missed a delta (or the server restarted), resync
+        return;
+      }
+      usernameDirectory.current = { epoch, version: delta.version };
+      setValidUsernames((prev) => applyUsernameDeltas(prev, [delta]));
+    };
+
     const handleUserRoleUpdated = () => {
       console.log("[DEBUG] Received user_role_updated");
     };
@@ -76,13 +175,15 @@ const useChatSocket = () => {
     socket.on("rate_limited", (data) => alert(`You're sending messages too fast! Wait ${data.time_remaining}s...`));
     socket.on("set_username", (data) => {
       setUsername(data.username);
+      requestUsernameDirectory();
+      fetchRooms();
       userColors.current[data.username] = {
         lightColor: data.color,
         darkColor: getAdjustedColor(data.color, true),
       };
     });
-    socket.on("chat_history", (history) => {
-      const updated = history.map((msg) => {
+    const normalizeHistory = (history) =>
+      history.map((msg) => {
         const normalized = msg.username.toLowerCase();
         if (!userColors.current[normalized]) {
           const light = msg.color || "#888";
@@ -91,15 +192,39 @@ const useChatSocket = () => {
             darkColor: getAdjustedColor(light, true),
           };
         }
-        return { ...msg, validUsernames: msg.validUsernames || [] };
+        return msg;
       });
-      setMessages(updated);
+
+    socket.on("chat_history", (page) => {
+      if (currentRoomRef.current === null) {
+        currentRoomRef.current = page.room_id; // The server puts new sockets in the default room
+        setCurrentRoom(page.room_id);
+      }
+      if (page.room_id !== currentRoomRef.current) return;
+      historyCursor.current = page.has_more ? page.cursor : null;
+      setMessages(normalizeHistory(page.messages));
+    });
+    socket.on("older_messages", (page) => {
+      loadingOlder.current = false;
+      if (page.error || page.room_id !== currentRoomRef.current) return;
+      historyCursor.current = page.has_more ? page.cursor : null;
+      setMessages((prev) => [...normalizeHistory(page.messages), ...prev]);
     });
     socket.on("message", handleMessage);
     socket.on("message_edited", handleMessageEdited);
+    socket.on("file_preview", handleFilePreview);
+    socket.on("username_directory", handleUsernameDirectory);
+    socket.on("username_directory_delta", handleUsernameDirectoryDelta);
+
+    socket.on("room_created", (room) => {
+      setRooms((prev) =>
+        prev.some((r) => r.room_id === room.room_id)
+          ? prev
+          : [...prev, room].sort((a, b) => a.name.localeCompare(b.name))
+      );
+    });
 
-    socket.on("update_user_list", (users) => {
-      setOnlineUsers(users);
+    const rememberUserColors = (users) =>
       users.forEach((user) => {
         const normalized = user.username.toLowerCase();
         if (!userColors.current[normalized]) {
@@ -109,7 +234,45 @@ const useChatSocket = () => {
           };
         }
       });
-    });
+
+    // Joins and updates replace the user's entry (in place when they're already listed), so
+    // applying a change the snapshot already contains is harmless
+    const applyPresenceChanges = (users, changes) =>
+      changes.reduce((acc, change) => {
+        if (change.op === "user_left") {
+          return acc.filter((user) => user.username !== change.username);
+        }
+        const names = [change.user.username, change.old_username];
+        const index = acc.findIndex((user) => names.includes(user.username));
+        const rest = acc.filter((user) => !names.includes(user.username));
+        if (index === -1) return [...rest, change.user];
+        return [...rest.slice(0, index), change.user, ...rest.slice(index)];
+      }, users);
+
+    const handlePresenceSnapshot = (snapshot) => {
+      if (snapshot.room_id !== currentRoomRef.current) return;
+      presence.current = { roomId: snapshot.room_id, epoch: snapshot.epoch, seq: snapshot.seq };
+      rememberUserColors(snapshot.users);
+      setOnlineUsers(snapshot.users);
+    };
+
+    const handlePresenceDelta = (delta) => {
+      const { roomId, epoch, seq } = presence.current;
+      if (delta.room_id !== currentRoomRef.current || roomId !== delta.room_id) return; // No snapshot yet
+      if (delta.epoch === epoch && delta.seq <= seq) return; // Already in the snapshot
+      if (delta.epoch !== epoch || delta.seq !== seq + 1) {
+        // Missed a delta (or the server restarted): ignore deltas until the new snapshot arrives
+        presence.current = { roomId: null, epoch: null, seq: null };
+        socket.emit("request_presence", { room_id: delta.room_id });
+        return;
+      }
+      presence.current = { roomId, epoch, seq: delta.seq };
+      rememberUserColors(delta.changes.filter((change) => change.user).map((change) => change.user));
+      setOnlineUsers((prev) => applyPresenceChanges(prev, delta.changes));
+    };
+
+    socket.on("presence_snapshot", handlePresenceSnapshot);
+    socket.on("presence_delta", handlePresenceDelta);
 
     socket.on("user_role_updated", handleUserRoleUpdated);
 
@@ -155,9 +318,15 @@ const useChatSocket = () => {
       socket.off("rate_limited");
       socket.off("set_username");
       socket.off("chat_history");
+      socket.off("older_messages");
       socket.off("message", handleMessage);
       socket.off("message_edited", handleMessageEdited);
-      socket.off("update_user_list");
+      socket.off("file_preview", handleFilePreview);
+      socket.off("username_directory", handleUsernameDirectory);
+      socket.off("username_directory_delta", handleUsernameDirectoryDelta);
+      socket.off("room_created");
+      socket.off("presence_snapshot", handlePresenceSnapshot);
+      socket.off("presence_delta", handlePresenceDelta);
       socket.off("user_role_updated", handleUserRoleUpdated);
       socket.off("ban_notice");
       socket.off("ban_response");
@@ -188,9 +357,15 @@ const useChatSocket = () => {
     setUsername,
     hasJoined,
     handleJoin,
+    loadOlderMessages,
     onlineUsers,
     setOnlineUsers,
+    validUsernames,
     userColors,
+    rooms,
+    currentRoom,
+    switchRoom,
+    createRoom,
   };
 };
 
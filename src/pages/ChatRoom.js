@@ -4,12 +4,14 @@ import useChatSocket from "../hooks/useChatSocket";
 import MessageList from "../components/MessageList";
 import InputBar from "../components/InputBar";
 import Sidebar from "../components/Sidebar";
+import SearchPanel from "../components/SearchPanel";
 import TooltipPanel from "../components/TooltipPanel";
 import HamburgerMenu from "../components/HamburgerMenu";
 import WelcomeScreen from "./WelcomeScreen";
 import "../styles/ChatRoom.css";
 import useDarkMode from "../hooks/useDarkMode.js";
 import { socket } from "../hooks/useChatSocket";
+import { uploadFileInChunks } from "../hooks/chunkedUpload";
 
 const ChatRoom = () => {
   const {
@@ -17,8 +19,14 @@ const ChatRoom = () => {
     username,
     hasJoined,
     handleJoin,
+    loadOlderMessages,
     onlineUsers,
+    validUsernames,
     userColors,
+    rooms,
+    currentRoom,
+    switchRoom,
+    createRoom,
   } = useChatSocket();
 
   if (typeof window.socket === 'undefined') {
@@ -111,16 +119,7 @@ const ChatRoom = () => {
         return;
       }
 
-      const formData = new FormData();
-      formData.append("file", pendingFile);
-      formData.append("username", username);
-
-      fetch("http://localhost:5000/upload", {
-        method: "POST",
-        body: formData,
-        credentials: "include",
-      })
-        .then((res) => res.json())
+      uploadFileInChunks(pendingFile, currentRoom)
         .then((data) => {
           if (data.file_url) console.log("Uploaded:", data.file_url);
         })
@@ -130,7 +129,7 @@ const ChatRoom = () => {
       setInput("");
       setSuggestions([]);
     } else {
-      socket.emit("message", { message: input });
+      socket.emit("message", { message: input, room_id: currentRoom });
       setInput("");
       setSuggestions([]);
     }
@@ -168,13 +167,16 @@ const ChatRoom = () => {
       />
       <div className="chatroom-main">
         <div className="left-group">
-          <h1>Chatroom</h1>
+          <h1>#{rooms.find((room) => room.room_id === currentRoom)?.name || "general"}</h1>
+          <SearchPanel roomId={currentRoom} darkMode={darkMode} />
           <MessageList
             messages={messages}
             username={username}
             userColors={userColors.current}
+            validUsernames={validUsernames}
             darkMode={darkMode}
             handleTextHighlight={handleTextHighlight}
+            onLoadOlder={loadOlderMessages}
           />
         </div>
         <Sidebar
@@ -185,6 +187,10 @@ const ChatRoom = () => {
           darkMode={darkMode}
           sessionUsername={sessionUsername}
           isModerator={isModerator}
+          rooms={rooms}
+          currentRoom={currentRoom}
+          onSelectRoom={switchRoom}
+          onCreateRoom={createRoom}
         />
       </div>
 
@@ -1,5 +1,5 @@
 // src/pages/ManageUsers.js
-import React, { useState, useEffect, useCallback } from "react";
+import React, { useState, useEffect, useCallback, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { socket, initializeSocket } from "../hooks/socket";
 import HamburgerMenu from "../components/HamburgerMenu";
@@ -7,45 +7,64 @@ import UserContextMenu from "../components/UserContextMenu";
 import useDarkMode from "../hooks/useDarkMode";
 import "../styles/ManageUsers.css";
 
+// Both lists are paged by the server (ordered by username) and filtered by username prefix
+const fetchUserPage = async (path, query, cursor) => {
+  const params = new URLSearchParams();
+  if (query) params.set("q", query);
+  if (cursor) params.set("cursor", cursor);
+  const res = await fetch(`http://localhost:5000/${path}?${params}`, { credentials: "include" });
+  return res.json();
+};
+
 const ManageUsers = () => {
   const [activeTab, setActiveTab] = useState("banned");
   const [bannedUsers, setBannedUsers] = useState([]);
   const [registeredUsers, setRegisteredUsers] = useState([]);
+  const [bannedCursor, setBannedCursor] = useState(null);
+  const [registeredCursor, setRegisteredCursor] = useState(null);
+  const [searchQuery, setSearchQuery] = useState("");
+  const searchQueryRef = useRef("");
   const [sessionUsername, setSessionUsername] = useState("");
   const [isModerator, setIsModerator] = useState(false);
   const [loading, setLoading] = useState(true);
   const [darkMode, setDarkMode] = useDarkMode();
   const navigate = useNavigate();
 
-  const fetchBannedUsers = async () => {
+  const fetchBannedUsers = useCallback(async (cursor = null) => {
     try {
-      const res = await fetch("http://localhost:5000/banned-users", { credentials: "include" });
-      const data = await res.json();
+      const data = await fetchUserPage("banned-users", searchQueryRef.current, cursor);
       console.log("[DEBUG] Banned users fetched:", data);
       if (data.banned_users) {
-        setBannedUsers(data.banned_users);
-      } else if (data.banned) { 
-        // fallback, just in case server still sends 'banned'
-        setBannedUsers(data.banned);
+        setBannedUsers((prev) => (cursor ? [...prev, ...data.banned_users] : data.banned_users));
+        setBannedCursor(data.has_more ? data.cursor : null);
       }
     } catch (err) {
       console.error("Error fetching banned users:", err);
     }
-  };
+  }, []);
 
-  const fetchRegisteredUsers = useCallback(async () => {
+  const fetchRegisteredUsers = useCallback(async (cursor = null) => {
     try {
-      const res = await fetch("http://localhost:5000/registered-users", { credentials: "include" });
-      const data = await res.json();
+      const data = await fetchUserPage("registered-users", searchQueryRef.current, cursor);
       if (data.users) {
-        const bannedUsernames = bannedUsers.map((user) => user.username);
-        const filtered = data.users.filter((user) => !bannedUsernames.includes(user.username));
-        setRegisteredUsers(filtered);
+        setRegisteredUsers((prev) => (cursor ? [...prev, ...data.users] : data.users));
+        setRegisteredCursor(data.has_more ? data.cursor : null);
       }
     } catch (err) {
       console.error("Error fetching registered users:", err);
     }
-  }, [bannedUsers]);
+  }, []);
+
+  // Re-run the search a moment after the user stops typing
+  useEffect(() => {
+    if (!isModerator) return;
+    const timer = setTimeout(() => {
+      searchQueryRef.current = searchQuery.trim();
+      fetchBannedUsers();
+      fetchRegisteredUsers();
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery, isModerator, fetchBannedUsers, fetchRegisteredUsers]);
 
   useEffect(() => {
     if (!socket || !socket.connected) {
@@ -63,7 +82,7 @@ const ManageUsers = () => {
     return () => {
       socket.off('success', handleSuccess);
     };
-  }, [fetchRegisteredUsers]);  
+  }, [fetchRegisteredUsers, fetchBannedUsers]);
 
   useEffect(() => {
     const verifySession = async () => {
@@ -72,9 +91,7 @@ const ManageUsers = () => {
         const data = await res.json();
         if (res.ok && data.is_moderator) {
           setIsModerator(true);
-          setSessionUsername(data.username || "");
-          await fetchBannedUsers();
-          await fetchRegisteredUsers();
+          setSessionUsername(data.username || "");  // The lists load once isModerator is set
         } else {
           alert("Access denied. You must be a moderator.");
           navigate("/account");
@@ -123,7 +140,7 @@ const ManageUsers = () => {
       socket.off("unban_response");
       socket.off("promote_response");
     };
-  }, [navigate, fetchRegisteredUsers]);
+  }, [navigate, fetchRegisteredUsers, fetchBannedUsers]);
 
   if (loading) {
     return <div className="loading-overlay">Loading...</div>;
@@ -156,6 +173,14 @@ const ManageUsers = () => {
         </button>
       </div>
 
+      <input
+        type="text"
+        className="user-search"
+        placeholder="Search usernames..."
+        value={searchQuery}
+        onChange={(e) => setSearchQuery(e.target.value)}
+      />
+
       <div className="list-container">
         {activeTab === "banned" && (
           <ul className="registry-list">
@@ -179,6 +204,11 @@ const ManageUsers = () => {
           ))}
         </ul>             
         )}
+        {activeTab === "banned" && bannedCursor && (
+          <button className="load-more" onClick={() => fetchBannedUsers(bannedCursor)}>
+            Load more
+          </button>
+        )}
 
         {activeTab === "registered" && (
           <ul className="registry-list">
@@ -205,6 +235,11 @@ const ManageUsers = () => {
           ))}
         </ul>        
         )}
+        {activeTab === "registered" && registeredCursor && (
+          <button className="load-more" onClick={() => fetchRegisteredUsers(registeredCursor)}>
+            Load more
+          </button>
+        )}
       </div>
     </div>
     </div>
@@ -0,0 +1,15 @@
+import os, sys, tempfile
+
+import pytest
+
+# server.py reads DATABASE_URL at import time; point it at a throwaway SQLite file
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='chat-tests-'), 'test.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+
+@pytest.fixture(scope='session')
+def app():
+    with server.app.app_context():
+        server.apply_migrations()
+        yield server.app
@@ -0,0 +1,36 @@
+# EXPLAIN the hot queries against a migrated database so a dropped or unusable index fails CI
+import os, re
+
+import pytest
+
+import server
+from server import db
+
+SCHEMA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'schema.sql')
+
+@pytest.mark.parametrize('name, statement, expected_index', server.hot_queries(), ids=lambda value: value if isinstance(value, str) else '')
+def test_hot_query_uses_index(app, name, statement, expected_index):
+    with db.engine.connect() as conn:
+        used, full_scan = server.explain_query(conn, statement)
+    assert not full_scan, f"{name} scans the table (indexes used: {sorted(used)})"
+    if expected_index is not None:
+        assert expected_index in used, f"{name} uses {sorted(used)} instead of {expected_index}"
+
+def test_model_indexes_match_schema_sql(app):
+    with open(SCHEMA_SQL) as f:
+        schema = f.read()
+    expected = {}
+    for table, body in re.findall(r'CREATE TABLE (\w+) \((.*?)\n\);', schema, re.S):
+        expected[table] = set(re.findall(r'^\s*INDEX (\w+)', body, re.M))
+    for table in db.metadata.sorted_tables:
+        if table.name in expected:
+            assert {index.name for index in table.indexes} == expected[table.name], table.name
+
+def test_migrations_rename_generated_index_names(app):
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql('DROP INDEX "idx_uploads_sha256"')
+        conn.exec_driver_sql('CREATE INDEX "ix_Uploads_sha256" ON "Uploads" (sha256)')
+        conn.execute(server.SchemaMigration.__table__.delete().where(server.SchemaMigration.revision == '0005_index_names'))
+    assert server.apply_migrations() == ['0005_index_names']
+    names = {index['name'] for index in db.inspect(db.engine).get_indexes('Uploads')}
+    assert 'idx_uploads_sha256' in names and 'ix_Uploads_sha256' not in names